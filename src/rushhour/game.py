@@ -1,6 +1,8 @@
 import heapq
+import random
 from collections import deque
 from enum import IntEnum
+from functools import cache
 from typing import Literal
 
 import numpy as np
@@ -9,6 +11,12 @@ from rich.columns import Columns
 from rich.console import Console
 from rich.table import Table
 
+try:
+    from numba import njit, types
+    from numba.typed import Dict
+except ImportError:  # optional, without it a_star runs the pure Python search
+    njit = None
+
 BOARD_SIZE = 6
 
 """
@@ -17,7 +25,7 @@ Conventions:
 - The bottom right corner is (BOARD_SIZE - 1, BOARD_SIZE - 1)
 - Horizontal movements towards the right are positive, and towards the left are negative.
 - Vertical movements downwards are positive, and upwards are negative.
-- In the board, zero (0) represents an empty cell
+- The board is an occupancy bitboard: cell (row, col) is bit `row * BOARD_SIZE + col`, a set bit is an occupied cell
 """
 
 
@@ -44,6 +52,8 @@ class CarName(IntEnum):
     R = 16  # green
 
 
+_NAME_BY_CHAR: dict[str, CarName] = {c.name[0]: c for c in CarName}
+
 COLORS_RICH: dict[CarName, str] = {
     CarName.X: "bright_red",
     CarName.A: "bright_green",
@@ -69,6 +79,301 @@ class Orientation(IntEnum):
     V = 1
 
 
+@cache
+def car_mask(orientation: Orientation, size: int, start: tuple[int, int], board_size: int = BOARD_SIZE) -> int:
+    """
+    Bitmask of the cells covered by a car of the given orientation and size placed at `start`.
+    """
+    step = 1 if orientation == Orientation.H else board_size
+    cell = start[0] * board_size + start[1]
+    mask = 0
+    for k in range(size):
+        mask |= 1 << (cell + k * step)
+    return mask
+
+
+_rng = random.Random(0)
+# ZOBRIST[orientation][size][position]: random key of a car of that shape at the packed position `(row << 3) | col`;
+# the board hash is the XOR over all cars. Car names are left out, so the hash is the same for boards that only
+# differ in how cars are named (canonical form).
+ZOBRIST: list[list[list[int]]] = [[[_rng.getrandbits(64) for _ in range(BOARD_SIZE << 3)] for _ in range(4)] for _ in Orientation]
+
+
+def _build_mask_table() -> list[list[list[int]]]:
+    """
+    MASKS[orientation][size][position]: cells covered by a car at the packed position `(row << 3) | col`,
+    0 where the car does not fit on the board.
+    """
+    table = [[[0] * (BOARD_SIZE << 3) for _ in range(4)] for _ in Orientation]
+    for orientation in Orientation:
+        for size in (2, 3):
+            for row in range(BOARD_SIZE):
+                for col in range(BOARD_SIZE):
+                    end = col + size - 1 if orientation == Orientation.H else row + size - 1
+                    if end < BOARD_SIZE:
+                        table[orientation][size][(row << 3) | col] = car_mask(orientation, size, (row, col))
+    return table
+
+
+MASKS = _build_mask_table()
+
+
+def exit_mask(end: tuple[int, int], board_size: int = BOARD_SIZE) -> int:
+    """
+    Bitmask of the cells in the row of `end` to the right of it, i.e., the way to the exit.
+    """
+    return ((1 << (board_size - 1 - end[1])) - 1) << (end[0] * board_size + end[1] + 1)
+
+
+# EXIT_MASKS[position]: the way to the exit of the X car (length 2, horizontal) at the packed position `(row << 3) | col`
+EXIT_MASKS: list[int] = [exit_mask((p >> 3, (p & 7) + 1)) if MASKS[Orientation.H][2][p] else 0 for p in range(BOARD_SIZE << 3)]
+
+
+def _build_move_table() -> np.ndarray:
+    """
+    Lookup table of the moves available to a car along its row or column.
+
+    Indexed by [orientation, size, start, line], where `start` is the car's position along the line
+    and `line` the occupancy bits of that row or column. Entries encode `(pos_moves << 4) | neg_moves`.
+    """
+    table = np.zeros((2, 4, BOARD_SIZE, 1 << BOARD_SIZE), dtype=np.uint8)
+    for size in (2, 3):
+        for start in range(BOARD_SIZE - size + 1):
+            for line in range(1 << BOARD_SIZE):
+                pos_moves = 0
+                while start + size + pos_moves < BOARD_SIZE and not (line >> (start + size + pos_moves)) & 1:
+                    pos_moves += 1
+                neg_moves = 0
+                while start - neg_moves > 0 and not (line >> (start - neg_moves - 1)) & 1:
+                    neg_moves += 1
+                table[:, size, start, line] = (pos_moves << 4) | neg_moves
+    return table
+
+
+MOVES = _build_move_table()
+
+
+def row_bits(board: int, row: int) -> int:
+    """
+    The occupancy bits of a row, bit `col` set if the cell is occupied.
+    """
+    return (board >> (row * BOARD_SIZE)) & ((1 << BOARD_SIZE) - 1)
+
+
+def column_bits(board: int, col: int) -> int:
+    """
+    The occupancy bits of a column, bit `row` set if the cell is occupied.
+    """
+    bits = 0
+    for row in range(BOARD_SIZE):
+        bits |= ((board >> (row * BOARD_SIZE + col)) & 1) << row
+    return bits
+
+
+class BucketQueue:
+    """
+    Priority queue for small non-negative integer priorities: one bucket per priority.
+
+    Items with the same priority come out last in, first out. In A* (priority f) that pops the most
+    recently generated, i.e. deepest, states first among equal f.
+    """
+
+    def __init__(self):
+        self._buckets: list[list] = []
+        self._min = 0
+        self._size = 0
+
+    def push(self, priority: int, item):
+        while priority >= len(self._buckets):
+            self._buckets.append([])
+        self._buckets[priority].append(item)
+        self._min = min(self._min, priority)
+        self._size += 1
+
+    def pop(self):
+        while not self._buckets[self._min]:
+            self._min += 1
+        self._size -= 1
+        return self._buckets[self._min].pop()
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def _jit(func):
+    """
+    Compile `func` with numba when it is installed, otherwise leave it as plain Python.
+    """
+    return njit(cache=True)(func) if njit is not None else func
+
+
+@_jit
+def _core_heuristic(board, positions, x_slot, orientations, sizes, slot_masks, way_out):
+    """
+    Same lower bound as `Game.heuristic`, with the sets of cars as bitmasks over car slots.
+    """
+    n = positions.shape[0]
+    way_out_mask = way_out[positions[x_slot]]
+    if board & way_out_mask == 0:
+        return 0
+
+    xrow = positions[x_slot] >> 3
+    blockers = 0
+    secondary_blockers = 0
+    hemmed_in = np.zeros(n, dtype=np.int64)
+    n_hemmed_in = 0
+    for slot in range(n):
+        if slot_masks[slot, positions[slot]] & way_out_mask == 0:
+            continue
+        blockers += 1
+        if orientations[slot] == 0:
+            continue  # it can never leave the row of X
+        size = sizes[slot]
+        row, col = positions[slot] >> 3, positions[slot] & 7
+        n_routes = 0
+        in_the_way = np.zeros(2, dtype=np.int64)
+        for first, last in ((xrow - size, row - 1), (row + size, xrow + size)):
+            if first < 0 or last >= BOARD_SIZE:
+                continue
+            route = 0
+            for r in range(first, last + 1):
+                route |= 1 << (r * BOARD_SIZE + col)
+            for other in range(n):
+                if slot_masks[other, positions[other]] & route:
+                    in_the_way[n_routes] |= 1 << other
+            n_routes += 1
+        if n_routes == 1:
+            secondary_blockers |= in_the_way[0]
+        elif in_the_way[0] != 0 and in_the_way[1] != 0:
+            hemmed_in[n_hemmed_in] = in_the_way[0] | in_the_way[1]
+            n_hemmed_in += 1
+
+    h = blockers
+    for slot in range(n):
+        h += (secondary_blockers >> slot) & 1
+    for i in range(n_hemmed_in):
+        if hemmed_in[i] & secondary_blockers == 0:
+            return h + 1
+    return h
+
+
+@_jit
+def _astar_core(start_board, start_positions, x_slot, orientations, sizes, slot_masks, slot_zobrist, way_out, moves_table):
+    """
+    A* over integer states, see `Game.a_star`.
+
+    Cars are referred to by slot (index in `start_positions`); `slot_masks` and `slot_zobrist` hold the mask
+    and hash of every slot at every packed position, and `way_out` the cells in front of X at each of its positions.
+    Returns (found, move slots, move increments, number of states).
+    """
+    n = start_positions.shape[0]
+    if start_board & way_out[start_positions[x_slot]] == 0:
+        return True, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), 1
+
+    start_hash = 0
+    for slot in range(n):
+        start_hash ^= slot_zobrist[slot, start_positions[slot]]
+
+    # node pool, the positions of node i are positions[i * n : (i + 1) * n]
+    boards = [start_board]
+    hashes = [start_hash]
+    positions = [start_positions[slot] for slot in range(n)]
+    g_costs = [0]
+    parents = [-1]
+    move_slots = [-1]
+    move_incs = [0]
+    closed = [False]
+    index = Dict.empty(key_type=types.int64, value_type=types.int64)
+    index[start_hash] = 0
+
+    # entries are (f << 48) | ((255 - g) << 40) | node, so the heap compares plain ints: lower f first, then deeper
+    # states first. The g field is 8 bits; beyond a depth of 255 (far above any 6x6 solution) the tie-break is
+    # flattened to 0 but f still orders correctly.
+    heap = [(_core_heuristic(start_board, start_positions, x_slot, orientations, sizes, slot_masks, way_out) << 48) | (255 << 40)]
+    current = start_positions.copy()
+    goal, goal_slot, goal_inc = -1, -1, 0
+    while heap and goal < 0:
+        node = heapq.heappop(heap) & ((1 << 40) - 1)
+        if closed[node]:
+            continue
+        closed[node] = True
+        board, zhash, cost = boards[node], hashes[node], g_costs[node]
+        for slot in range(n):
+            current[slot] = positions[node * n + slot]
+
+        for slot in range(n):
+            position = current[slot]
+            row, col = position >> 3, position & 7
+            if orientations[slot] == 0:
+                line, start, step = (board >> (row * BOARD_SIZE)) & ((1 << BOARD_SIZE) - 1), col, 1
+            else:
+                line, start, step = 0, row, 8
+                for r in range(BOARD_SIZE):
+                    line |= ((board >> (r * BOARD_SIZE + col)) & 1) << r
+            moves = np.int64(moves_table[orientations[slot], sizes[slot], start, line])
+            pos_moves, neg_moves = moves >> 4, moves & 0xF
+            others = board & ~slot_masks[slot, position]
+            others_hash = zhash ^ slot_zobrist[slot, position]
+            for k in range(pos_moves + neg_moves):
+                inc = k + 1 if k < pos_moves else pos_moves - k - 1
+                new_position = position + inc * step
+                new_board = others | slot_masks[slot, new_position]
+                new_hash = others_hash ^ slot_zobrist[slot, new_position]
+                new_cost = cost + 1
+                current[slot] = new_position
+
+                # goal test first, a goal never goes through the index or the heap
+                if new_board & way_out[current[x_slot]] == 0:
+                    goal, goal_slot, goal_inc = node, slot, inc
+                    break
+
+                new_node = index.get(new_hash, -1)
+                if new_node < 0:
+                    new_node = len(boards)
+                    index[new_hash] = new_node
+                    boards.append(new_board)
+                    hashes.append(new_hash)
+                    for other in range(n):
+                        positions.append(current[other])
+                    g_costs.append(new_cost)
+                    parents.append(node)
+                    move_slots.append(slot)
+                    move_incs.append(inc)
+                    closed.append(False)
+                elif closed[new_node] or new_cost >= g_costs[new_node]:
+                    current[slot] = position
+                    continue
+                else:
+                    g_costs[new_node] = new_cost
+                    parents[new_node] = node
+                    move_slots[new_node] = slot
+                    move_incs[new_node] = inc
+
+                f_score = new_cost + _core_heuristic(new_board, current, x_slot, orientations, sizes, slot_masks, way_out)
+                heapq.heappush(heap, (f_score << 48) | (max(0, 255 - new_cost) << 40) | new_node)
+                current[slot] = position
+            if goal >= 0:
+                break
+
+    if goal < 0:
+        return False, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), len(boards) - 1
+
+    # `goal` is the state the last move (goal_slot, goal_inc) was made from
+    depth = 1
+    node = goal
+    while parents[node] >= 0:
+        depth += 1
+        node = parents[node]
+    slots = np.zeros(depth, dtype=np.int64)
+    incs = np.zeros(depth, dtype=np.int64)
+    slots[depth - 1], incs[depth - 1] = goal_slot, goal_inc
+    node = goal
+    for i in range(depth - 2, -1, -1):
+        slots[i], incs[i] = move_slots[node], move_incs[node]
+        node = parents[node]
+    return True, slots, incs, len(boards)
+
+
 class Car:
     def __init__(
         self,
@@ -82,23 +387,13 @@ class Car:
         self.start = start
         self.size = self._size()
         self.board_size = board_size
+        self.occupancy_mask = car_mask(orientation, self.size, start, board_size) if self.in_board() else 0
 
     def _size(self) -> int:
         if self.name == CarName.X or self.name < CarName.O:
             return 2
         return 3
 
-    def move_by(self, inc: int) -> "Car":
-        """
-        Move a car by `inc` cells.
-
-        If inc > 0, move right (H) or down (V).
-        If inc < 0, move left (H) or up (V).
-        """
-        if self.orientation == Orientation.H:
-            return Car(self.name, self.orientation, (self.start[0], self.start[1] + inc))
-        return Car(self.name, self.orientation, (self.start[0] + inc, self.start[1]))
-
     def in_board(self) -> bool:
         return (self.start[0] >= 0 and self.start[1] >= 0) and (self.end[0] < self.board_size and self.end[1] < self.board_size)
 
@@ -111,25 +406,9 @@ class Car:
             return (self.start[0], self.start[1] + self.size - 1)
         return (self.start[0] + self.size - 1, self.start[1])
 
-    @property
-    def value(self) -> np.ndarray:
-        """
-        An array representing the car's value on the board.
-        """
-        return np.full(self.size, int(self.name), dtype=np.uint8)
-
-    @property
-    def indices(self) -> tuple[slice, int] | tuple[int, slice]:
-        """
-        The positions in the board occupied by the car.
-        """
-        if self.orientation == Orientation.H:
-            return self.start[0], slice(self.start[1], self.end[1] + 1)
-        return slice(self.start[0], self.end[0] + 1), self.start[1]
-
     @classmethod
     def from_string(cls, car_str: str) -> "Car":
-        name = CarName[car_str[0]]
+        name = _NAME_BY_CHAR[car_str[0]]
         orientation = Orientation.H if car_str[1] == "H" else Orientation.V
         x, y = int(car_str[2]), int(car_str[3])
         return cls(name, orientation, (x, y))
@@ -138,6 +417,25 @@ class Car:
         return f"{self.name.name}{self.orientation.name}{self.start[0]}{self.start[1]}"
 
 
+def moved_indices(orientation: Orientation, size: int, position: int, inc: int) -> tuple[int, int, int]:
+    """
+    Move a car of the given `orientation` and `size` at the packed `position` by `inc` cells, without building a new `Car`.
+
+    If inc > 0, move right (H) or down (V).
+    If inc < 0, move left (H) or up (V).
+
+    Returns the new start (row, col) and the cells it covers, 0 if the car would leave the board.
+    """
+    row, col = position >> 3, position & 7
+    if orientation == Orientation.H:
+        col += inc
+    else:
+        row += inc
+    if row < 0 or col < 0 or row >= BOARD_SIZE or col >= BOARD_SIZE:
+        return row, col, 0
+    return row, col, MASKS[orientation][size][(row << 3) | col]
+
+
 class Game:
     def __init__(self, initial_state: list[str], board_size: int = BOARD_SIZE):
         """
@@ -145,9 +443,14 @@ class Game:
 
         Initial states follow the format: <CarName><Orientation><x><y>
         ["XH23", "AH01", "BH12", ...]
+
+        `_cars` maps every car name to its (orientation, size), which never change; the current
+        positions are kept in `_positions`, indexed by `CarName` and packed as `(row << 3) | col`.
         """
-        self.board = np.zeros((board_size, board_size), dtype=np.uint8)
-        self._cars: dict[CarName, Car] = {}
+        self.board: int = 0
+        self._cars: dict[CarName, tuple[Orientation, int]] = {}
+        self._positions: list[int] = [0] * (max(CarName) + 1)
+        self.zhash: int = 0
         self.board_size = board_size
 
         for car_str in initial_state:
@@ -163,39 +466,62 @@ class Game:
     def add_car(self, car: Car):
         if not self._can_place_car(car):
             raise ValueError(f"Cannot place car {car.name.name} at {car.start} with orientation {car.orientation}")
-        self._cars[car.name] = car
+        self._cars[car.name] = (car.orientation, car.size)
+        self._positions[car.name] = (car.start[0] << 3) | car.start[1]
+        self.zhash ^= ZOBRIST[car.orientation][car.size][self._positions[car.name]]
         self._place_car(car)
 
     def _can_place_car(self, car: Car) -> bool:
         if not car.in_board():
             return False
 
-        return bool(np.all(self.board[car.indices] == 0))
+        return self.board & car.occupancy_mask == 0
 
     def _place_car(self, car: Car):
-        self.board[car.indices] = car.value
+        self.board |= car.occupancy_mask
 
-    def _can_move_car(self, car: Car, inc: int) -> bool:
-        c = car.move_by(inc)
-        if not c.in_board():
-            return False
+    def _start(self, car_name: CarName) -> tuple[int, int]:
+        position = self._positions[car_name]
+        return position >> 3, position & 7
 
-        return bool(np.all((self.board[c.indices] == 0) | (self.board[c.indices] == c.name)))
+    def _car(self, car_name: CarName) -> Car:
+        """
+        The car at its current position.
+        """
+        orientation, _ = self._cars[car_name]
+        return Car(car_name, orientation, self._start(car_name), self.board_size)
+
+    def _can_move_car(self, car_name: CarName, inc: int) -> bool:
+        orientation, size = self._cars[car_name]
+        position = self._positions[car_name]
+        _, _, new_mask = moved_indices(orientation, size, position, inc)
+        if not new_mask:
+            return False
 
-    def _move_car(self, car: Car, inc: int):
-        c = car.move_by(inc)
-        if not c.in_board():
-            raise ValueError(f"Car {c.name.name} moved out of bounds to {c.start}")
+        return self.board & ~MASKS[orientation][size][position] & new_mask == 0
 
-        if bool(np.all((self.board[c.indices] == 0) | (self.board[c.indices] == c.name))):
-            self.board[car.indices] = 0
-            self.board[c.indices] = c.value
-            self._cars[c.name] = c
-        else:
+    def _move_car(self, car_name: CarName, inc: int):
+        """
+        Move a car by `inc` cells in place.
+        """
+        orientation, size = self._cars[car_name]
+        position = self._positions[car_name]
+        new_row, new_col, new_mask = moved_indices(orientation, size, position, inc)
+        if not new_mask:
+            raise ValueError(f"Car {car_name.name} moved out of bounds to {(new_row, new_col)}")
+
+        new_position = (new_row << 3) | new_col
+        mask = MASKS[orientation][size][position]
+        if self.board & ~mask & new_mask:
             raise ValueError(
-                f"Cannot move car {car.name.name} (by inc={inc}) (name={c.name}) ({car.indices} {c.indices}) as it overlaps with another car or is out of bounds\n{self.__str__()}. Cars: {[str(x) for x in self.cars.values()]}"
+                f"Cannot move car {car_name.name} (by inc={inc}) from {(position >> 3, position & 7)} to {(new_row, new_col)} as it overlaps with another car\n{self.__str__()}. Cars: {[str(x) for x in self.cars.values()]}"
             )
 
+        self.board = (self.board & ~mask) | new_mask
+        self._positions[car_name] = new_position
+        keys = ZOBRIST[orientation][size]
+        self.zhash ^= keys[position] ^ keys[new_position]
+
     def move_sequence(self, moves: list[str], draw_steps: bool = False, console: Console | None = None, boards_per_row: int = 5):
         """
         Sequence of moves look like this: ["X2", "A1", "B-1", "A+3"]
@@ -205,7 +531,7 @@ class Game:
         for n, move in enumerate(moves):
             try:
                 car, inc = move[0], int(move[1:])
-                car = CarName[car]
+                car = _NAME_BY_CHAR[car]
             except (KeyError, ValueError):
                 raise ValueError(f"Invalid move: {move}. Expected format is '<CarName><inc>', e.g., 'X2' or 'X-1'.")
 
@@ -216,7 +542,7 @@ class Game:
                 if inc < 0 and abs(inc) > neg_moves:
                     raise ValueError(f"Invalid move: {move}. Car {car.name} can only move up to {neg_moves} steps backward.")
 
-                self._move_car(self._cars[car], inc)
+                self._move_car(car, inc)
                 if draw_steps:
                     boards.append(self.draw(console, title=f"{n+1}:{move}", print_table=False))
 
@@ -224,71 +550,68 @@ class Game:
             for i in range(0, len(boards), boards_per_row):
                 console.print(Columns(boards[i : i + boards_per_row]))
 
-    def _obstacles_before_exit(self) -> int:
+    def is_solution(self) -> bool:
         """
-        Count the number of obstacles (cars) in the way of the X car to exit.
+        Check if the game is solved, i.e., the X car can exit the board
         """
-        xcar = self._cars.get(CarName.X)
-        end = xcar.end
-        return int((self.board[end[0], end[1] + 1 :] != 0).sum())
+        return self.board & EXIT_MASKS[self._positions[CarName.X]] == 0
 
-    def is_solution(self) -> bool:
+    def _grid(self) -> bytearray:
         """
-        Check if the game is solved, i.e., the X car can exit the board
+        The board as one byte per cell, `row * board_size + col` (the bit order of the bitboard),
+        holding the value of the `CarName` in it, 0 for empty cells.
         """
-        return self._obstacles_before_exit() == 0
+        grid = bytearray(self.board_size * self.board_size)
+        for car_name, (orientation, size) in self._cars.items():
+            mask = MASKS[orientation][size][self._positions[car_name]]
+            while mask:
+                grid[(mask & -mask).bit_length() - 1] = car_name
+                mask &= mask - 1
+        return grid
+
+    def _rows(self) -> list[list[CarName | None]]:
+        grid = self._grid()
+        return [[CarName(cell) if cell else None for cell in grid[r * self.board_size : (r + 1) * self.board_size]] for r in range(self.board_size)]
 
     def __str__(self):
         board_str = ""
-        for row in self.board:
-            board_str += " ".join(self._cars[cell.item()].name.name if cell.item() != 0 else "." for cell in row) + "\n"
+        for row in self._rows():
+            board_str += " ".join(name.name if name is not None else "." for name in row) + "\n"
         return board_str.strip()
 
     def draw(self, console: Console, print_table: bool = True, title: str | None = None) -> Table:
         table = Table(show_header=False, show_lines=True, box=box.SQUARE, padding=(0, 1), title=title)
-        for row in self.board:
-            table.add_row(*[(f"[bold {COLORS_RICH[self._cars[cell.item()].name]}]{self._cars[cell.item()].name.name}[/]" if cell.item() != 0 else " ") for cell in row])
+        for row in self._rows():
+            table.add_row(*[(f"[bold {COLORS_RICH[name]}]{name.name}[/]" if name is not None else " ") for name in row])
         if print_table:
             console.print(table)
         return table
 
-    def _count_zeros(self, array: np.ndarray, position: int) -> int:
-        """
-        Count the number of zeros in the array starting from the given position.
-        """
-        if position >= len(array) or array[position] != 0:
-            return 0
-
-        zeros = array[position:] == 0
-        return int(zeros.sum()) if zeros.all() else int(zeros.argmin())
-
     @property
     def cars(self) -> dict[CarName, Car]:
-        return self._cars
+        return {car_name: self._car(car_name) for car_name in self._cars}
 
     def _get_car_moves(self, car_name: CarName) -> tuple[int, int]:
         """
         Get the possible moves for a car.
         Returns a tuple of (positve moves, negative moves).
         """
-        car = self._cars[car_name]
-        if car.orientation == Orientation.H:
-            row = self.board[car.start[0]]
-            pos_moves = self._count_zeros(row, car.end[1] + 1)
-            neg_moves = self._count_zeros(np.flip(row), self.board_size - (car.start[1]))
+        orientation, size = self._cars[car_name]
+        position = self._positions[car_name]
+        row, col = position >> 3, position & 7
+        if orientation == Orientation.H:
+            moves = int(MOVES[Orientation.H, size, col, row_bits(self.board, row)])
         else:
-            col = self.board[:, car.start[1]]
-            pos_moves = self._count_zeros(col, car.end[0] + 1)
-            neg_moves = self._count_zeros(np.flip(col), self.board_size - (car.start[0]))
+            moves = int(MOVES[Orientation.V, size, row, column_bits(self.board, col)])
 
-        return pos_moves, neg_moves
+        return moves >> 4, moves & 0xF
 
-    def _get_possible_moves(self) -> dict[CarName, np.ndarray]:
+    def _get_possible_moves(self) -> dict[CarName, tuple[int, int]]:
         moves = {}
         for car_name in self._cars:
             pos_moves, neg_moves = self._get_car_moves(car_name)
             if pos_moves > 0 or neg_moves > 0:
-                moves[car_name] = np.array([pos_moves, neg_moves], dtype=np.uint8)
+                moves[car_name] = (pos_moves, neg_moves)
         return moves
 
     def _degrees_freedom(self) -> int:
@@ -296,48 +619,133 @@ class Game:
         Count the total number of possible moves for all cars.
         """
         moves = self._get_possible_moves()
-        return int(np.vstack(list(moves.values())).sum())
+        return sum(pos_moves + neg_moves for pos_moves, neg_moves in moves.values())
+
+    def _state(self) -> tuple[int, tuple[int, ...], int]:
+        """
+        Snapshot of the state: the occupancy bitboard, the position of every car and the Zobrist hash.
+        """
+        return self.board, tuple(self._positions), self.zhash
+
+    def _set_state(self, state: tuple[int, tuple[int, ...], int]):
+        self.board, positions, self.zhash = state
+        self._positions = list(positions)
+
+    def _successors(self) -> list[tuple[tuple[int, int], tuple[int, tuple[int, ...], int]]]:
+        """
+        All the states one move away from the current one, as ((car, inc), state) pairs.
+
+        They are built in a single sweep from the move table and the masks, without moving cars on the board.
+        """
+        board, positions, zhash = self._state()
+        successors = []
+        for car_name, (pos_moves, neg_moves) in self._get_possible_moves().items():
+            orientation, size = self._cars[car_name]
+            masks = MASKS[orientation][size]
+            step = 1 if orientation == Orientation.H else 8  # one column or one packed row
+            position = positions[car_name]
+            others = board & ~masks[position]
+            keys = ZOBRIST[orientation][size]
+            others_zhash = zhash ^ keys[position]
+            for inc in [*range(1, pos_moves + 1), *range(-1, -neg_moves - 1, -1)]:
+                new_position = position + inc * step
+                new_positions = positions[:car_name] + (new_position,) + positions[car_name + 1 :]
+                new_zhash = others_zhash ^ keys[new_position]
+                successors.append(((car_name, inc), (others | masks[new_position], new_positions, new_zhash)))
+        return successors
 
     @staticmethod
-    def tensor_to_tuple(tensor: np.ndarray) -> tuple:
-        return tuple(tensor.flatten().tolist())
+    def _move_label(move: tuple[int, int]) -> str:
+        car_idx, inc = move
+        return f"{CarName(car_idx).name}+{inc}" if inc > 0 else f"{CarName(car_idx).name}{inc}"
+
+    @classmethod
+    def _path(cls, came_from: dict[int, tuple], state_key: int) -> list[str]:
+        """
+        Walk the parent pointers from `state_key` back to the start and return the moves in order.
+
+        Entries of `came_from` start with (parent hash, (car, inc)); the parent of the initial state is None.
+        """
+        moves = []
+        parent_key, move = came_from[state_key][:2]
+        while parent_key is not None:
+            moves.append(cls._move_label(move))
+            parent_key, move = came_from[parent_key][:2]
+        return moves[::-1]
 
     @staticmethod
     def complement(seq: list[str]) -> list[str]:
         return [f"{x[0]}{-int(x[1:])}" if x[1] == "+" else f"{x[0]}+{abs(int(x[1:]))}" for x in seq]
 
-    def heuristic(self) -> int:
+    def heuristic(self, state: tuple[int, tuple[int, ...], int] | None = None) -> int:
+        """
+        Lower bound on the number of moves left (admissible) from `state`, the current state by default:
+        - every car between X and the exit (blocker) has to move at least once,
+        - every car in the only way out of a blocker (secondary blocker) has to move as well,
+        - if a blocker is hemmed in on both sides by cars not counted so far, one of them has to move too.
+        """
         # return int(self._degrees_freedom()) # this doesn't make sense as a heuristic
-        return int(self._obstacles_before_exit())
+        board, positions, _ = state if state is not None else self._state()
+        xrow = positions[CarName.X] >> 3
+        way_out = EXIT_MASKS[positions[CarName.X]]
+        if not board & way_out:
+            return 0
+
+        masks = {car_name: MASKS[orientation][size][positions[car_name]] for car_name, (orientation, size) in self._cars.items()}
+        blockers = [car_name for car_name, mask in masks.items() if mask & way_out]
+        secondary_blockers = set()
+        hemmed_in = []
+        for car_name in blockers:
+            orientation, size = self._cars[car_name]
+            if orientation == Orientation.H:
+                continue  # it can never leave the row of X
+            row, col = positions[car_name] >> 3, positions[car_name] & 7
+            routes = []
+            if xrow - size >= 0:  # cells to cross to end up above X
+                routes.append(car_mask(Orientation.V, row - xrow + size, (xrow - size, col), self.board_size))
+            if xrow + size < self.board_size:  # cells to cross to end up below X
+                routes.append(car_mask(Orientation.V, xrow - row + 1, (row + size, col), self.board_size))
+            in_the_way = [{other for other, mask in masks.items() if mask & route} for route in routes]
+            if len(in_the_way) == 1:
+                secondary_blockers |= in_the_way[0]
+            elif all(in_the_way):
+                hemmed_in.append(set().union(*in_the_way))
+
+        extra = any(not (cars & secondary_blockers) for cars in hemmed_in)
+        return len(blockers) + len(secondary_blockers) + int(extra)
 
     def bfs(self) -> tuple[list[str] | None, int]:
-        visited = set()
+        """
+        Breadth-first search from the initial state.
+
+        The search only runs forward: any board with the way to the exit clear is a goal, and those boards
+        are not known in advance, so there is no goal frontier to grow backwards from (no bidirectional search).
+        """
+        if self.is_solution():
+            return [], 1
+
         queue = deque()
-        queue.append((self.tensor_to_tuple(self.board), [], self._cars.copy()))
+        # came_from[hash] = (parent hash, (car, inc))
+        came_from = {self.zhash: (None, None)}
+        queue.append(self._state())
 
         while queue:
-            board_tuple, moves_seq, cars = queue.popleft()
-            self.board = np.array(board_tuple, dtype=np.uint8).reshape(self.board_size, self.board_size).copy()
-            self._cars = cars.copy()
-
-            possible_moves = self._get_possible_moves()
-            for car_name in possible_moves:
-                pos_moves, neg_moves = possible_moves[car_name].tolist()
-                moves = [p for p in range(1, pos_moves + 1)] + [-n for n in range(1, neg_moves + 1)]
-                car = self._cars[car_name]
-                for inc in moves:
-                    self._move_car(car, inc)
-                    new_move = f"{car.name.name}+{inc}" if inc > 0 else f"{car.name.name}{inc}"
-                    if self.is_solution():
-                        return moves_seq + [new_move], len(visited) + 1
-
-                    tensor_tuple = self.tensor_to_tuple(self.board)
-                    if tensor_tuple not in visited:
-                        queue.append((tensor_tuple, moves_seq + [new_move], self._cars.copy()))
-                        visited.add(tensor_tuple)
-                    self._move_car(self._cars[car_name], -inc)  # backtrack with updated car
-
-        return None, len(visited)
+            state = queue.popleft()
+            self._set_state(state)
+            state_key = self.zhash
+
+            for move, new_state in self._successors():
+                board, positions, new_state_key = new_state
+                if not board & EXIT_MASKS[positions[CarName.X]]:
+                    came_from[new_state_key] = (state_key, move)
+                    self._set_state(new_state)
+                    return self._path(came_from, new_state_key), len(came_from) - 1
+
+                if new_state_key not in came_from:
+                    came_from[new_state_key] = (state_key, move)
+                    queue.append(new_state)
+
+        return None, len(came_from) - 1
 
     def a_star(self) -> tuple[list[str] | None, int]:
         """
@@ -349,45 +757,81 @@ class Game:
         where n is the next node to be evaluated,
         g(n) is the cost of the path from the start node to n,
         and h(n) is a heuristic that estimates the cost of the cheapest path from n to the goal (wikipedia).
+
+        Runs the numba-compiled search (`_astar_core`) when numba is installed.
         """
-        heap = []
-        g_costs = {self.tensor_to_tuple(self.board): 0}
-        heapq.heappush(heap, (self.heuristic(), 0, self.tensor_to_tuple(self.board), [], self._cars.copy()))
-        visited = set()
+        if self.is_solution():
+            return [], 1
+        if njit is not None:
+            return self._a_star_jit()
+
+        queue = BucketQueue()
+        # payload[hash] = (parent hash, (car, inc), g), queue entries only carry the state itself
+        payload = {self.zhash: (None, None, 0)}
+        unseen = (None, None, float("inf"))
+        queue.push(self.heuristic(), self._state())
+        # the heuristic is consistent, so a state popped once is already reached at its lowest cost
+        closed = set()
 
-        while heap:
-            _, cost, board_tuple, moves_seq, cars = heapq.heappop(heap)
+        while queue:
+            state = queue.pop()
+            state_key = state[2]
 
-            if cost > g_costs.get(board_tuple, float("inf")):
+            if state_key in closed:
                 continue
-
-            self.board = np.array(board_tuple, dtype=np.uint8).reshape(self.board_size, self.board_size).copy()
-            self._cars = cars.copy()
-
-            possible_moves = self._get_possible_moves()
-            for car_name in possible_moves:
-                pos_moves, neg_moves = possible_moves[car_name].tolist()
-                moves = [p for p in range(1, pos_moves + 1)] + [-n for n in range(1, neg_moves + 1)]
-                car = self._cars[car_name]
-                for inc in moves:
-                    self._move_car(car, inc)
-                    new_move = f"{car.name.name}+{inc}" if inc > 0 else f"{car.name.name}{inc}"
-
-                    if self.is_solution():
-                        return moves_seq + [new_move], len(visited) + 1
-
-                    new_cost = cost + 1
-                    new_board_tuple = self.tensor_to_tuple(self.board)
-                    if (new_board_tuple not in visited and
-                        new_cost < g_costs.get(new_board_tuple, float("inf"))):
-                        g_costs[new_board_tuple] = new_cost
-                        f_score = new_cost + self.heuristic() # f(n) = g(n) + h(n)
-                        heapq.heappush(heap, (f_score, new_cost, new_board_tuple, moves_seq + [new_move], self._cars.copy()))
-                        visited.add(new_board_tuple)
-
-                    self._move_car(self._cars[car_name], -inc)  # backtrack with updated car
-
-        return None, len(visited)
+            closed.add(state_key)
+            cost = payload[state_key][2]
+
+            self._set_state(state)
+
+            candidates = []
+            goal = None
+            for move, new_state in self._successors():
+                board, positions, _ = new_state
+                if not board & EXIT_MASKS[positions[CarName.X]]:
+                    goal = (move, new_state)
+                    break
+                candidates.append((move, new_state))
+
+            # keep only the successors that improve on their best known cost (closed states never do)
+            new_cost = cost + 1
+            candidates = [(move, new_state) for move, new_state in candidates if new_cost < payload.get(new_state[2], unseen)[2]]
+            for move, new_state in candidates:
+                payload[new_state[2]] = (state_key, move, new_cost)
+
+            # the siblings generated before the goal are recorded too, so the count matches `_astar_core`
+            if goal is not None:
+                move, new_state = goal
+                payload[new_state[2]] = (state_key, move, new_cost)
+                self._set_state(new_state)
+                return self._path(payload, new_state[2]), len(payload) - 1
+            for _, new_state in candidates:
+                f_score = new_cost + self.heuristic(new_state) # f(n) = g(n) + h(n)
+                queue.push(f_score, new_state)
+
+        return None, len(payload) - 1
+
+    def _a_star_jit(self) -> tuple[list[str] | None, int]:
+        slots = list(self._cars)
+        cars = list(self._cars.values())
+        orientations = np.array([orientation for orientation, _ in cars], dtype=np.int64)
+        sizes = np.array([size for _, size in cars], dtype=np.int64)
+        slot_masks = np.array([MASKS[orientation][size] for orientation, size in cars], dtype=np.int64)
+        slot_zobrist = np.array([ZOBRIST[orientation][size] for orientation, size in cars], dtype=np.uint64).view(np.int64)
+        way_out = np.array(EXIT_MASKS, dtype=np.int64)
+        start_positions = np.array([self._positions[car_name] for car_name in slots], dtype=np.int64)
+
+        found, move_slots, move_incs, nodes_visited = _astar_core(
+            self.board, start_positions, slots.index(CarName.X), orientations, sizes, slot_masks, slot_zobrist, way_out, MOVES
+        )
+        if not found:
+            return None, nodes_visited
+
+        moves = []
+        for slot, inc in zip(move_slots.tolist(), move_incs.tolist()):
+            self._move_car(slots[slot], inc)
+            moves.append(self._move_label((slots[slot], inc)))
+        return moves, nodes_visited
 
     def solve(self, solver: Literal["a_star", "bfs"] = "a_star") -> tuple[list[str] | None, int]:
         if solver == "a_star":